@@ -0,0 +1,130 @@
+import warnings
+
+import pytest
+
+from violetear import StyleSheet
+from violetear.animation import Animation
+from violetear.style import Style
+
+
+def make_sheet():
+    sheet = StyleSheet()
+    sheet.select(".title").font(24)
+    return sheet
+
+
+def test_attribute_and_item_access_return_the_same_style():
+    sheet = make_sheet()
+    assert sheet.title is sheet["title"]
+
+
+def test_attribute_access_marks_style_as_used():
+    sheet = make_sheet()
+    style = sheet.title
+    assert style in sheet._used
+
+
+def test_dunder_lookup_fails_without_warning():
+    sheet = make_sheet()
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+
+        with pytest.raises(AttributeError):
+            sheet.__html__
+
+    assert caught == []
+
+
+def test_undefined_style_warns_at_the_caller():
+    sheet = make_sheet()
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+
+        with pytest.raises(AttributeError):
+            sheet.missing
+
+        with pytest.raises(KeyError):
+            sheet["missing"]
+
+    assert [w.filename for w in caught] == [__file__, __file__]
+
+
+def make_full_sheet():
+    sheet = StyleSheet(normalize=True)
+    fade = Animation("fade").start(opacity=0).end(opacity=1)
+    sheet.select(".title").font(24).animate(fade)
+
+    with sheet.media(max_width=600):
+        sheet.select(".title").font(16)
+
+    return sheet
+
+
+def test_iter_css_joins_to_render():
+    sheet = make_full_sheet()
+    assert "".join(sheet.iter_css()) == sheet.render()
+
+
+def test_render_to_write_only_file():
+    class Writer:
+        def __init__(self):
+            self.chunks = []
+
+        def write(self, chunk):
+            self.chunks.append(chunk)
+
+    sheet = make_full_sheet()
+    fp = Writer()
+
+    assert sheet.render(fp) is None
+    assert "".join(fp.chunks) == sheet.render()
+
+
+def test_iter_css_yields_before_rendering_styles(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("style rendered too early")
+
+    sheet = make_full_sheet()
+    monkeypatch.setattr(Style, "_css_block", fail)
+
+    assert next(sheet.iter_css()) == "/* Made with violetear */\n"
+
+
+def make_base():
+    return Style().font(16).rule("color", "black").rule("margin", 0)
+
+
+def test_own_rules_override_base_rules():
+    sheet = StyleSheet(base=make_base())
+    style = sheet.select(".title").rule("color", "red")
+
+    assert style._all_rules()["color"] == "red"
+    assert "color: black" not in style.css()
+
+
+def test_inherited_rule_order_matches_apply():
+    base = make_base()
+    sheet = StyleSheet(base=base)
+    inherited = sheet.select(".title").rule("padding", 4).rule("color", "red")
+    applied = Style(".title").apply(base).rule("padding", 4).rule("color", "red")
+
+    assert inherited.css() == applied.css()
+
+
+def test_style_with_only_base_rules_is_rendered():
+    sheet = StyleSheet(base=make_base())
+    style = sheet.select(".title")
+
+    assert bool(style)
+    assert sheet.render().endswith("/* Generated 1 styles */")
+
+
+def test_base_changes_reach_existing_styles():
+    base = make_base()
+    sheet = StyleSheet(base=base)
+    style = sheet.select(".title")
+    base.rule("padding", 4)
+
+    assert "padding: 4;" in style.css()
@@ -120,7 +120,7 @@ class Color:
     # #### `Color.towards`
 
     def towards(self, other: Color, percent: float, *, space="hls") -> Color:
-        space = dict(rgb=rgb, hls=hls, hsv=hsv)[space]
+        space = _SPACES[space]
 
         start_values = space(self)
         end_values = space(other)
@@ -145,10 +145,20 @@ class Color:
 
     # #### `Color.palette`
 
+    # This is equivalent to calling `start.towards(end, p)` for each step,
+    # but both endpoints are converted to the target space only once.
+
     @staticmethod
     def palette(start: Color, end: Color, steps: int, space="hls") -> List[Color]:
+        space = _SPACES[space]
+
+        start_values = space(start)
+        deltas = [e - s for s, e in zip(start_values, space(end))]
         percents = Unit.scale(float, 0, 1, steps)
-        return [start.towards(end, p, space=space) for p in percents]
+
+        return [
+            space(*[s + d * p for s, d in zip(start_values, deltas)]) for p in percents
+        ]
 
 
 # ## Color spaces
@@ -269,6 +279,15 @@ def hex(*args, **kwargs):
         return f"#{r}{g}{b}"
 
 
+# #### Color spaces by name
+
+# This maps the `space` argument in methods like `Color.towards` to its conversion function.
+# It is defined once here rather than on every call, since color transforms
+# like `Color.lighter` or `Color.brighter` all go through `Color.towards`.
+
+_SPACES = dict(rgb=rgb, hls=hls, hsv=hsv)
+
+
 # ## Basic color shorthands
 
 # #### `red`
@@ -1,4 +1,6 @@
-from .style import Style
+from typing import Union
+
+from .style import RawCSS, Style
 
 
 class MediaQuery:
@@ -7,14 +9,39 @@ class MediaQuery:
 
         self._sheet = sheet
 
-        self.min_width = min_width
-        self.max_width = max_width
+        self._min_width = min_width
+        self._max_width = max_width
         self.styles = []
 
-    def add(self, style: Style):
+        # The header only depends on the breakpoints, so we build it once
+        # instead of on every render, and rebuild it whenever they change.
+        self._css_header = self._make_css_header()
+
+    @property
+    def min_width(self) -> int:
+        return self._min_width
+
+    @min_width.setter
+    def min_width(self, min_width: int) -> None:
+        self._min_width = min_width
+        self._css_header = self._make_css_header()
+
+    @property
+    def max_width(self) -> int:
+        return self._max_width
+
+    @max_width.setter
+    def max_width(self, max_width: int) -> None:
+        self._max_width = max_width
+        self._css_header = self._make_css_header()
+
+    def add(self, style: Union[Style, RawCSS]):
         self.styles.append(style)
 
     def css(self) -> str:
+        return self._css_header
+
+    def _make_css_header(self) -> str:
         query = []
 
         if self.min_width:
@@ -5,13 +5,19 @@
 
 from __future__ import annotations
 
+# These are for interning attribute names, inheriting rules from a base style,
+# and memoizing parsed selectors:
+import sys
+from collections import ChainMap
+from functools import lru_cache
+
 # These are for typing our methods:
 from typing import Any, Callable, List, Tuple, Union, TYPE_CHECKING
 
 
 # These ones are internal to `violetear`:
 from .selector import Selector
-from .units import Unit, fr, ms, pc, minmax, rem, repeat, sec
+from .units import Unit, fr, ms, pc, minmax, rem, repeat, sec, _infer_str
 from .types import GridSize, GridTemplate, FontWeight
 from .color import Color, Colors, gray
 from .helpers import style_method
@@ -23,8 +29,51 @@ from .helpers import style_method
 if TYPE_CHECKING:
     from .animation import Animation
 
-# And this one is for generating CSS:
-import textwrap
+# ## Lazy units
+
+# Most fluent methods accept raw numbers that must be converted to a `Unit` (see `Unit.infer`).
+# Instead of doing that conversion when the rule is defined, we store a `_LazyUnit`
+# that only infers the actual unit when converted to `str`, i.e., when the style is rendered.
+# This way, styles that are defined but never rendered don't pay for it.
+
+
+class _LazyUnit:
+    __slots__ = ("value", "on_float")
+
+    def __init__(self, value, on_float=rem) -> None:
+        self.value = value
+        self.on_float = on_float
+
+    def __str__(self) -> str:
+        return _infer_str(self.value, on_float=self.on_float)
+
+
+# ## Lazy selectors
+
+# Selectors given as strings are parsed only when first needed (e.g., when rendering),
+# so styles that are defined but never rendered don't pay for it.
+# Parsed selectors are also memoized by their source string, since the same selectors
+# (e.g., `.span-1` ... `.span-12`) are often selected again under different media queries.
+# This is safe because a `Selector` is never modified after creation:
+# methods like `Selector.on` always return a new instance.
+
+
+@lru_cache(maxsize=2048)
+def _parse_selector(selector: str) -> Selector:
+    return Selector.parse(selector)
+
+
+# ## Multi-line values
+
+# Multi-line rule values (e.g., `grid-template-areas`) have their continuation lines
+# indented along with the rule. Blank lines are left untouched, like `textwrap.indent` does.
+
+
+def _indent_continuation(value: str, prefix: str) -> str:
+    first, *rest = value.split("\n")
+    lines = [prefix + line if line.strip() else line for line in rest]
+    return "\n".join([first] + lines)
+
 
 # ## The `Style` class
 
@@ -39,39 +88,87 @@ import textwrap
 # that allow chained invocation to quickly build a complex style.
 
 
+# Since a stylesheet can easily hold hundreds of styles, `Style` declares its
+# attributes in `__slots__` to avoid carrying a per-instance `__dict__`.
+
+
 class Style:
+    __slots__ = (
+        "_selector",
+        "_selector_src",
+        "_parent",
+        "_base",
+        "_rules",
+        "_children",
+        "_transforms",
+        "_transitions",
+        "_animations",
+        "_animation_configs",
+    )
+
     def __init__(
-        self, selector: Union[str, Selector] = None, *, parent: Style = None, owner=None
+        self,
+        selector: Union[str, Selector] = None,
+        *,
+        parent: Style = None,
+        base: Style = None,
+        owner=None,
     ) -> None:
         """Create a new instance of `Style`.
 
         **Parameters**:
 
         - `selector`: The selector to which this style applies. Can be `None`, or a string,
-                      in which case it is parsed with `Selector.parse`.
+                      in which case it is parsed with `Selector.parse` when first needed.
         - `parent`: An optional parent style (e.g., if this is an state or children style) so
                     that when checking which styles are used, the parent can be referenced.
+        - `base`: An optional style whose rules are inherited by this style.
+                  Rules are shared rather than copied, and rules defined in this style
+                  override the inherited ones.
         """
-        if isinstance(selector, str):
-            selector = Selector.parse(selector)
-
         self.selector = selector
         self._parent = parent
+        self._base = base
         self._rules = {}
         self._children = {}
-        self._transforms = {}
-        self._transitions = []
-        self._animations = set()
-        self._animation_configs = []
+
+        # Most styles never use transitions, transforms or animations,
+        # so these containers are only created the first time they are needed.
+        self._transforms = None
+        self._transitions = None
+        self._animations = None
+        self._animation_configs = None
+
+    # #### `Style.selector`
+
+    @property
+    def selector(self) -> Selector:
+        if self._selector_src is not None:
+            self._selector = _parse_selector(self._selector_src)
+            self._selector_src = None
+
+        return self._selector
+
+    @selector.setter
+    def selector(self, selector: Union[str, Selector]) -> None:
+        if isinstance(selector, str):
+            self._selector = None
+            self._selector_src = selector
+        else:
+            self._selector = selector
+            self._selector_src = None
 
     # ### Basic rule manipulation
     # These methods allows manipulating rules manually.
 
     # #### `Style.rule`
-    # Adds a rule to the internal dictionary. It will be casted to `str` for uniformity.
+    # Adds a rule to the internal dictionary. The value is stored as is,
+    # and it will be casted to `str` only when rendering.
     # This implies that simple values like `int` and `float` are represented as is,
     # but complex values like `Unit` and `Color` will be converted to their string representation
     # using their corresponding `__str__` methods.
+    # Attribute names are interned, so that the same name (e.g., `'margin-left'`)
+    # is shared by all styles, even when built dynamically like in `Style.rules`.
 
     def rule(self, attr: str, value) -> Style:
         """Define a new CSS rule.
@@ -79,9 +176,9 @@ class Style:
         **Parameters**:
 
         - `attr`: a CSS attribute (e.g., `'font-size'`)
-        - `value`: a value for the attribute. It will be converted to `str` internally.
+        - `value`: a value for the attribute. It will be converted to `str` when rendering.
         """
-        self._rules[attr] = str(value)
+        self._rules[sys.intern(attr)] = value
         return self
 
     # #### `Style.rules`
@@ -101,14 +198,9 @@ class Style:
     # The `apply` method enables style composition, by copying all the rules
     # in one or more input styles into this style.
 
-    # At some point we could implement this in a lazy manner, such that rules
-    # are only realyy copied when converting to CSS using the `css` method.
-    # However, at the moment I can't see an interesting use case for that functionality,
-    # since I seldom modify styles after they are created.
-    # Maybe this could be interesting for programmatically-created styles with lots of parameters, or for
-    # some kind of interactive application where the user creates a theme.
-    # However, in favour of YAGNI, I will refrain from implementing that functionality until
-    # proven necessary.
+    # Rules are copied eagerly here. For the lazy alternative, where rules are only
+    # resolved when converting to CSS, see the `base` parameter in `Style.__init__`,
+    # which is how a `StyleSheet` shares its base style among all its styles.
 
     def apply(self, *others: Style) -> Style:
         """Copy rules from other styles.
@@ -120,11 +212,22 @@ class Style:
         - `others`: A sequence of `Style` instances to copy their rules.
         """
         for other in others:
-            for attr, value in other._rules.items():
+            for attr, value in other._all_rules().items():
                 self.rule(attr, value)
 
         return self
 
+    # #### `Style._all_rules`
+    # Returns the rules of this style, including those inherited from the base style.
+    # The `ChainMap` looks up own rules first, and iterates inherited rules
+    # before the new ones, so the order is the same as if the base was applied.
+
+    def _all_rules(self):
+        if self._base is None:
+            return self._rules
+
+        return ChainMap(self._rules, self._base._all_rules())
+
     # ### Typographic styles
     # These methods allow manipulating font and text properties.
 
@@ -140,7 +243,7 @@ class Style:
         family: str = None,
     ) -> Style:
         if size:
-            self.rule("font-size", Unit.infer(size))
+            self.rule("font-size", _LazyUnit(size))
 
         if weight:
             self.rule("font-weight", weight)
@@ -233,13 +336,13 @@ class Style:
         self, width: Unit = None, color: Color = None, *, radius: Unit = None
     ) -> Style:
         if width is not None:
-            self.rule("border-width", Unit.infer(width))
+            self.rule("border-width", _LazyUnit(width))
 
         if color is not None:
             self.rule("border-color", color)
 
         if radius is not None:
-            self.rule("border-radius", Unit.infer(radius))
+            self.rule("border-radius", _LazyUnit(radius))
 
     # ### Visibility styles
 
@@ -268,26 +371,26 @@ class Style:
     @style_method
     def width(self, value=None, *, min=None, max=None) -> Style:
         if value is not None:
-            self.rule("width", Unit.infer(value, on_float=pc))
+            self.rule("width", _LazyUnit(value, pc))
 
         if min is not None:
-            self.rule("min-width", Unit.infer(min, on_float=pc))
+            self.rule("min-width", _LazyUnit(min, pc))
 
         if max is not None:
-            self.rule("max-width", Unit.infer(max, on_float=pc))
+            self.rule("max-width", _LazyUnit(max, pc))
 
     # #### `Style.height`
 
     @style_method
     def height(self, value=None, *, min=None, max=None) -> Style:
         if value is not None:
-            self.rule("height", Unit.infer(value, on_float=pc))
+            self.rule("height", _LazyUnit(value, pc))
 
         if min is not None:
-            self.rule("min-height", Unit.infer(min, on_float=pc))
+            self.rule("min-height", _LazyUnit(min, pc))
 
         if max is not None:
-            self.rule("max-height", Unit.infer(max, on_float=pc))
+            self.rule("max-height", _LazyUnit(max, pc))
 
     # #### `Style.size`
 
@@ -309,15 +412,15 @@ class Style:
         bottom=None,
     ) -> Style:
         if all is not None:
-            self.rule("margin", Unit.infer(all))
+            self.rule("margin", _LazyUnit(all))
         if left is not None:
-            self.rule("margin-left", Unit.infer(left))
+            self.rule("margin-left", _LazyUnit(left))
         if right is not None:
-            self.rule("margin-right", Unit.infer(right))
+            self.rule("margin-right", _LazyUnit(right))
         if top is not None:
-            self.rule("margin-top", Unit.infer(top))
+            self.rule("margin-top", _LazyUnit(top))
         if bottom is not None:
-            self.rule("margin-bottom", Unit.infer(bottom))
+            self.rule("margin-bottom", _LazyUnit(bottom))
 
     # #### `Style.padding`
 
@@ -332,15 +435,15 @@ class Style:
         bottom=None,
     ) -> Style:
         if all is not None:
-            self.rule("padding", Unit.infer(all))
+            self.rule("padding", _LazyUnit(all))
         if left is not None:
-            self.rule("padding-left", Unit.infer(left))
+            self.rule("padding-left", _LazyUnit(left))
         if right is not None:
-            self.rule("padding-right", Unit.infer(right))
+            self.rule("padding-right", _LazyUnit(right))
         if top is not None:
-            self.rule("padding-top", Unit.infer(top))
+            self.rule("padding-top", _LazyUnit(top))
         if bottom is not None:
-            self.rule("padding-bottom", Unit.infer(bottom))
+            self.rule("padding-bottom", _LazyUnit(bottom))
 
     # #### `Style.rounded`
 
@@ -349,7 +452,7 @@ class Style:
         if radius is None:
             radius = 0.25
 
-        self.rule("border-radius", Unit.infer(radius))
+        self.rule("border-radius", _LazyUnit(radius))
 
     # ### Layout styles
 
@@ -388,7 +491,7 @@ class Style:
         if justify is not None:
             self.rule("justify-content", justify)
 
-        self.rule("gap", Unit.infer(gap))
+        self.rule("gap", _LazyUnit(gap))
 
     # #### `Style.flex`
 
@@ -406,7 +509,7 @@ class Style:
             self.rule("flex-shrink", float(shrink))
 
         if basis is not None:
-            self.rule("flex-basis", Unit.infer(basis, on_float=fr))
+            self.rule("flex-basis", _LazyUnit(basis, fr))
 
     # #### `Style.grid`
 
@@ -441,7 +544,7 @@ class Style:
         elif auto_rows is not None:
             self.rule("grid-auto-rows", auto_rows)
 
-        self.rule("gap", Unit.infer(gap, on_float=fr))
+        self.rule("gap", _LazyUnit(gap, fr))
 
     # #### `Style.columns`
 
@@ -516,13 +619,13 @@ class Style:
         self.rule("position", position)
 
         if left is not None:
-            self.rule("left", Unit.infer(left))
+            self.rule("left", _LazyUnit(left))
         if right is not None:
-            self.rule("right", Unit.infer(right))
+            self.rule("right", _LazyUnit(right))
         if top is not None:
-            self.rule("top", Unit.infer(top))
+            self.rule("top", _LazyUnit(top))
         if bottom is not None:
-            self.rule("bottom", Unit.infer(bottom))
+            self.rule("bottom", _LazyUnit(bottom))
 
     # #### `Style.absolute`
 
@@ -562,6 +665,9 @@ class Style:
         timing: str = "linear",
         delay: Unit = ms(0),
     ) -> Style:
+        if self._transitions is None:
+            self._transitions = []
+
         self._transitions.append(
             (
                 property,
@@ -598,6 +704,9 @@ class Style:
         scale_y: float = None,
         rotate: Unit = None,
     ) -> Style:
+        if self._transforms is None:
+            self._transforms = {}
+
         if translate_x is not None:
             self._transforms["translateX"] = Unit.infer(translate_x)
         if translate_y is not None:
@@ -643,6 +752,10 @@ class Style:
         timing: str = "linear",
         direction: str = "normal",
     ) -> Style:
+        if self._animations is None:
+            self._animations = set()
+            self._animation_configs = []
+
         self._animation_configs.append(
             (animation.name, Unit.infer(duration, sec, ms), timing, iter, direction)
         )
@@ -690,14 +803,75 @@ class Style:
 
     # #### `Style.css`
 
-    def css(self, inline: bool = False) -> str:
+    def css(self, inline: bool = False, indent: int = 0) -> str:
+        """Returns the CSS representation of this style.
+
+        **Parameters**:
+
+        - `inline`: If `True`, only the rules are returned, as in a `style` attribute.
+        - `indent`: Number of spaces to prefix every line with (e.g., inside a media query).
+
+        **Examples**:
+
+        Multi-line values are indented along with their rule:
+
+        ```python
+        >>> style = Style(".grid").rule("grid-template-areas", '"a b"\\n\\n"c d"')
+        >>> print(style.css())
+        .grid {
+            grid-template-areas: "a b"
+        <BLANKLINE>
+            "c d";
+        }
+
+        ```
+
+        And they keep their alignment when the whole block is indented:
+
+        ```python
+        >>> print(style.css(indent=4))
+            .grid {
+                grid-template-areas: "a b"
+        <BLANKLINE>
+                "c d";
+            }
+
+        ```
+        """
+        rules = self._all_rules()
+
         if inline:
-            return "; ".join(f"{attr}: {value}" for attr, value in self._rules.items())
+            return "; ".join(f"{attr}: {value}" for attr, value in rules.items())
 
-        rules = "\n".join(f"{attr}: {value};" for attr, value in self._rules.items())
+        return self._css_block(rules, indent)
+
+    # #### `Style._css_block`
+    # Builds the CSS block for an already merged set of rules (see `Style._all_rules`),
+    # so that `StyleSheet` can merge the rules of each style only once when rendering.
+    # Rules are written pre-indented into a single list of parts,
+    # so the whole block is built with just one final `join`.
+
+    def _css_block(self, rules, indent: int = 0) -> str:
+        prefix = " " * indent
+        rule_prefix = prefix + "    "
 
         selector = self.selector.css() if self.selector is not None else ""
-        return f"{selector} {{\n{textwrap.indent(rules, 4*' ')}\n}}"
+        parts = [prefix, selector, " {\n"]
+        extend = parts.extend
+
+        for attr, value in rules.items():
+            value = str(value)
+
+            if "\n" in value:
+                value = _indent_continuation(value, rule_prefix)
+
+            extend((rule_prefix, attr, ": ", value, ";\n"))
+
+        if not rules:
+            parts.append("\n")
+
+        parts.extend((prefix, "}"))
+        return "".join(parts)
 
     # #### `Style.inline`
 
@@ -712,4 +886,37 @@ class Style:
     # #### `Style.__bool__`
 
     def __bool__(self):
-        return len(self._rules) > 0
+        return bool(self._rules) or (self._base is not None and bool(self._base))
+
+
+# ## The `RawCSS` class
+
+# A `RawCSS` holds a fragment of precomputed CSS (see `StyleSheet.raw_css`).
+# It stands in for a `Style` inside a stylesheet or media query,
+# with the same `selector` attribute and `css` method, so it can be rendered in order
+# with the rest of the styles, but its text is never parsed.
+
+
+class RawCSS:
+    __slots__ = ("text",)
+
+    selector = None
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    # #### `RawCSS.css`
+
+    def css(self, inline: bool = False, indent: int = 0) -> str:
+        if not indent:
+            return self.text
+
+        prefix = " " * indent
+        lines = self.text.split("\n")
+
+        return "\n".join(prefix + line if line.strip() else line for line in lines)
+
+    # #### `RawCSS.__bool__`
+
+    def __bool__(self):
+        return bool(self.text)
@@ -7,19 +7,31 @@ and allows rendering stylesheets either as files or as strings to be injected in
 # Regular imports:
 
 import io
+import itertools
 from pathlib import Path
-from typing import Set
+from typing import Iterator, Set
 from warnings import warn
-import textwrap
 
 from violetear.animation import Animation
 
 # Internal imports:
 
-from .selector import Selector
-from .style import Style
+from .style import RawCSS, Style
 from .media import MediaQuery
 
+# The normalization rules are read once at import time and shared by all
+# stylesheets, instead of hitting the disk for every `StyleSheet(normalize=True)`.
+
+try:
+    _NORMALIZE_CSS = (Path(__file__).parent / "normalize.css").read_text()
+except FileNotFoundError:
+    _NORMALIZE_CSS = None
+
+
+# The warning shown when accessing an undefined style (see `StyleSheet.__getitem__`).
+
+_UNDEFINED_STYLE = "Style {} not defined"
+
 # ## The `StyleSheet` class
 
 
@@ -36,7 +48,9 @@ class StyleSheet:
         - `normalize`: If `True` then the stylesheet will contain a set of normalization
                        rules taken from <https://github.com/sindresorhus/modern-normalize>.
         - `base`: A style to use as base for all newly defined styles
-                  (i.e., any new style will `apply` the base style).
+                  (i.e., any new style will inherit the rules of the base style).
+                  Rules are inherited by reference, so later changes to the base style
+                  also apply to styles selected before them.
         """
         self.styles = []
         self.medias = []
@@ -50,7 +64,10 @@ class StyleSheet:
             self.add(style)
 
         if normalize:
-            self._preamble = open(Path(__file__).parent / "normalize.css").read()
+            if _NORMALIZE_CSS is None:
+                raise FileNotFoundError("normalize.css is missing from violetear")
+
+            self._preamble = _NORMALIZE_CSS
         else:
             self._preamble = ""
 
@@ -60,8 +77,9 @@ class StyleSheet:
 
     # This method renders the stylesheet to CSS. It can work in two ways:
     # either to write the rules to a file, or to return the rules as a string.
-    # Both ways are implemented using a file, either passed as parameter, or
-    # using an `io.StringIO` instance to generate an in-memory string.
+    # Both ways consume the chunks generated by [`iter_css`](#stylesheetiter_css),
+    # either writing them to a file, passed as parameter, or joining them
+    # into a single in-memory string.
 
     # Additionally this method can render a "dynamic" file, which means
     # just outputting the rules that are being used.
@@ -78,10 +96,15 @@ class StyleSheet:
                      This is useful when you inject the stylesheet into a template.
         """
 
-        # First we will decide whether to render to a file or a string.
-        # We will keep track of when we call `open` to make sure to call `close`.
-        # If `fp` is a path-like, we'll open it, and if it's `None`, we'll create
-        # an `io.StringIO` file to render to memory and return the stylesheet as a string.
+        # If `fp` is `None`, we'll just join all the chunks into a single string,
+        # which is cheaper than writing them to an `io.StringIO`.
+
+        if fp is None:
+            return "".join(self.iter_css(dynamic=dynamic))
+
+        # Otherwise, we will keep track of when we call `open` to make sure to call `close`.
+        # If `fp` is a path-like, we'll open it, and then write all the chunks into `fp`
+        # regardless of what it is.
 
         opened = False
 
@@ -89,77 +112,103 @@ class StyleSheet:
             fp = open(fp, "wt")
             opened = True
 
-        if fp is None:
-            fp = io.StringIO()
-            opened = True
+        for chunk in self.iter_css(dynamic=dynamic):
+            fp.write(chunk)
+
+        # And now we can close the file if we opened it,
+        # and decide whether to return a string or not depending on the
+        # type of file we have.
+
+        if isinstance(fp, io.StringIO):
+            result = fp.getvalue()
+        else:
+            result = None
+
+        if opened:
+            fp.close()
+
+        return result
+
+    # #### `StyleSheet.iter_css`
+
+    # This method generates the stylesheet as a sequence of CSS chunks,
+    # so consumers (like a web server streaming the response) can start
+    # sending data before the whole stylesheet is rendered.
+
+    def iter_css(self, *, dynamic: bool = False) -> Iterator[str]:
+        """Generate the stylesheet as a sequence of CSS strings.
+
+        Joining all the chunks gives the same result as `render()`.
+
+        **Parameters**:
+
+        - `dynamic`: The same as in `render`.
+        """
 
-        # Now we can write all the rules into `fp` regardless of what it is.
         # First the preamble (which can be empty or the content of normalize.css),
         # and then all the defined styles (including sub-styles).
         # Finally, all media-conditioned styles are rendered, wrapped appropiately.
 
-        self._write_preamble(fp)
+        yield from self._iter_preamble()
         total = 0
         animations: Set[Animation] = set()  # To collect all defined animations
 
         for style in self.styles:
-            total += self._render(style, fp, 0, animations)
+            total += yield from self._render(style, 0, animations)
 
         for media in self.medias:
-            fp.write(media.css())
-            fp.write("{\n")
+            yield media.css()
+            yield "{\n"
 
             for style in media.styles:
-                total += self._render(style, fp, 4, animations)
+                total += yield from self._render(style, 4, animations)
 
-            fp.write("}\n\n")
+            yield "}\n\n"
 
         # Generate all animations, but each one only once.
 
         for animation in sorted(animations, key=lambda a: a.name):
-            fp.write(animation.css())
-            fp.write("\n\n")
-
-        # And now we can close the file if we opened it,
-        # and decide whether to return a string or not depending on the
-        # type of file we have.
-
-        fp.write(f"/* Generated {total} styles */")
-
-        if isinstance(fp, io.StringIO):
-            result = fp.getvalue()
-        else:
-            result = None
-
-        if opened:
-            fp.close()
+            yield animation.css()
+            yield "\n\n"
 
-        return result
+        yield f"/* Generated {total} styles */"
 
     # ### Rendering helpers
 
-    def _write_preamble(self, fp):
-        fp.write("/* Made with violetear */\n")
-        fp.write("/* This file is autogenerated. Do not modify. */\n\n")
-
-        fp.write(self._preamble)
+    def _iter_preamble(self):
+        yield "/* Made with violetear */\n"
+        yield "/* This file is autogenerated. Do not modify. */\n\n"
 
         if self._preamble:
-            fp.write("\n")
+            yield self._preamble
+            yield "\n"
+
+    # Yields the CSS of a style and its sub-styles, and returns how many were rendered.
+
+    def _render(self, style: Style, indent, animations):
+        # Raw CSS fragments (see `StyleSheet.raw_css`) are only indented,
+        # and they don't count as styles.
+        if isinstance(style, RawCSS):
+            yield style.css(indent=indent)
+            yield "\n\n"
+            return 0
 
-    def _render(self, style: Style, fp, indent, animations):
         total = 0
 
-        for s in [style] + list(style._children.values()):
-            if not s._rules:
+        for s in itertools.chain((style,), style._children.values()):
+            # Inherited rules are merged once per style, both to check if there
+            # is anything to render and to render it.
+            rules = s._all_rules()
+
+            if not rules:
                 continue
 
-            fp.write(textwrap.indent(s.css(), indent * " "))
-            fp.write("\n\n")
+            yield s._css_block(rules, indent)
+            yield "\n\n"
             total += 1
 
-            for animation in s._animations:
-                animations.add(animation)
+            if s._animations:
+                animations.update(s._animations)
 
         return total
 
@@ -181,10 +230,9 @@ class StyleSheet:
             self._by_name[name] = style
             return style
 
-        style = Style(Selector.parse(selector))
-
-        if self._base:
-            style.apply(self._base)
+        # The selector is parsed lazily by `Style`, only if the style is ever rendered.
+        # The base style is shared by reference instead of copied into every new style.
+        style = Style(selector, base=self._base)
 
         return self.add(style, name=name)
 
@@ -199,15 +247,67 @@ class StyleSheet:
 
         return style
 
-    def extend(self, other: "StyleSheet") -> "StyleSheet":
-        for style in other.styles:
-            self.add(style)
+    def raw_css(self, css: str) -> RawCSS:
+        """Add a fragment of precomputed CSS that is rendered as is.
 
-        for name, style in other._by_name.items():
-            self._by_name[name] = style
+        This is useful for large sets of parametric rules that never need to be accessed
+        as `Style` instances, since it skips selector parsing and style creation entirely.
+        Like `add`, the fragment goes into the current media query, if any,
+        in which case it is indented like the surrounding styles.
 
-        for selector, style in other._by_selector.items():
-            self._by_selector[selector] = style
+        **Parameters**:
+
+        - `css`: The CSS text to render.
+
+        **Examples**:
+
+        ```python
+        >>> sheet = StyleSheet()
+        >>> _ = sheet.raw_css(".span-1 { width: 50%; }")
+        >>> print(sheet.render())
+        /* Made with violetear */
+        /* This file is autogenerated. Do not modify. */
+        <BLANKLINE>
+        .span-1 { width: 50%; }
+        <BLANKLINE>
+        /* Generated 0 styles */
+
+        ```
+
+        Inside a media query:
+
+        ```python
+        >>> sheet = StyleSheet()
+        >>> with sheet.media(max_width=600):
+        ...     _ = sheet.raw_css(".span-1 {\\n    width: 100%;\\n}")
+        >>> print(sheet.render())
+        /* Made with violetear */
+        /* This file is autogenerated. Do not modify. */
+        <BLANKLINE>
+        <BLANKLINE>
+        @media (max-width: 600px){
+            .span-1 {
+                width: 100%;
+            }
+        <BLANKLINE>
+        }
+        <BLANKLINE>
+        /* Generated 0 styles */
+
+        ```
+        """
+        return self.add(RawCSS(css))
+
+    def extend(self, other: "StyleSheet") -> "StyleSheet":
+        # Styles go wherever `add` would put them (i.e., in the current media query, if any),
+        # but in bulk instead of one by one.
+        if self._media is None:
+            self.styles.extend(other.styles)
+        else:
+            self._media.styles.extend(other.styles)
+
+        self._by_name.update(other._by_name)
+        self._by_selector.update(other._by_selector)
 
         for media in other.medias:
             self.medias.append(media.clone(self))
@@ -231,6 +331,25 @@ class StyleSheet:
     # the template and render the styles inline.
 
     def __getitem__(self, key) -> Style:
+        return self._get(key, stacklevel=3)
+
+    # Special names (like `__html__` or `__deepcopy__`) are routinely probed by
+    # template engines and the standard library, and they can never be style names,
+    # so they fail fast without going through the warning machinery.
+
+    def __getattr__(self, attr) -> Style:
+        if attr.startswith("__") and attr.endswith("__"):
+            raise AttributeError(attr)
+
+        try:
+            return self._get(attr, stacklevel=3)
+        except KeyError:
+            raise AttributeError(attr)
+
+    # Both accessors go through `_get`, which receives the `stacklevel` for the warning
+    # so that it points to the code accessing the style rather than to `violetear`.
+
+    def _get(self, key, stacklevel: int) -> Style:
         try:
             style = self._by_name[key]
             self._used.add(style)
@@ -240,11 +359,5 @@ class StyleSheet:
         # often silence `KeyError` exceptions and instead
         # return `None`, so you at least see a warning.
         except KeyError:
-            warn(f"Style {key} not defined")
+            warn(_UNDEFINED_STYLE.format(key), stacklevel=stacklevel)
             raise
-
-    def __getattr__(self, attr) -> Style:
-        try:
-            self[attr]
-        except KeyError:
-            raise AttributeError(attr)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+from functools import lru_cache
 from typing import List, Union
 
 from violetear.types import GridTemplate
@@ -71,6 +72,38 @@ class Unit:
             current += delta
 
 
+# Rendering inferred numeric units is memoized, since styles tend to be built
+# from a small set of repeated values (e.g., `size / 12` in a grid).
+# We cache the rendered string rather than the `Unit`, so no mutable object is shared
+# between callers. The cache is typed so that `1` (pixels) and `1.0` (rems or percents)
+# are never conflated, and zero is left out because `0.0 == -0.0` would make
+# the output depend on which one was rendered first.
+
+
+def _infer_str(x, on_float=rem, on_int=px) -> str:
+    """Returns the string of the unit inferred for `x`, i.e., `str(Unit.infer(x, ...))`.
+
+    **Examples**:
+
+    ```python
+    >>> _infer_str(-0.0), _infer_str(0.0)
+    ('-0.0rem', '0.0rem')
+    >>> _infer_str(1), _infer_str(1.0)
+    ('1px', '1.0rem')
+
+    ```
+    """
+    if isinstance(x, (int, float)) and x != 0:
+        return _cached_infer_str(x, on_float, on_int)
+
+    return str(Unit.infer(x, on_float, on_int))
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _cached_infer_str(x, on_float, on_int) -> str:
+    return str(Unit.infer(x, on_float, on_int))
+
+
 class repeat:
     def __init__(self, factor, *template: List[GridTemplate]) -> None:
         self.factor = factor